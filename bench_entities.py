@@ -0,0 +1,44 @@
+import os, sys, time
+import pygame
+
+# Frame time for many walking characters (update + depth sorted draw)
+# Usage: python bench_entities.py [frames]
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from engine.map import MapEngine
+from engine.level_data import LEVEL_1_FOREST
+from engine.entities import EntitySystem, load_character_frames
+
+def run(count, frames, screen, map_engine, sheet_frames, flow_field=None):
+    entities = EntitySystem()
+    k = 0
+    while len(entities) < count:
+        # Spread spawns over the walkable cells
+        x, y = (k * 37) % 700, (k * 53) % 700
+        if map_engine.is_walkable(x + 48, y + 84):
+            entities.spawn(sheet_frames, x, y, direction=k % 4)
+        k += 1
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        entities.update(16, map_engine, flow_field)
+        entities.draw(screen)
+    return (time.perf_counter() - start) * 1000 / frames
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pygame.init()
+    screen = pygame.display.set_mode((800, 800))
+    map_engine = MapEngine(LEVEL_1_FOREST["tileset"], tile_size=40, colorkey=LEVEL_1_FOREST["colorkey"])
+    for layer_name, data in LEVEL_1_FOREST["layers"].items():
+        map_engine.set_layer(layer_name, data)
+    sheet_frames = load_character_frames("assets/sara/sara_spritesheet.png")
+    portal_field = map_engine.navigation.get_flow_field(LEVEL_1_FOREST["portal_pos"])
+
+    print(f"{'characters':>10} {'wander ms':>10} {'to portal ms':>13}")
+    for count in [10, 100, 1000]:
+        wander = run(count, frames, screen, map_engine, sheet_frames)
+        to_portal = run(count, frames, screen, map_engine, sheet_frames, portal_field)
+        print(f"{count:>10} {wander:>10.2f} {to_portal:>13.2f}")
+    pygame.quit()
@@ -0,0 +1,95 @@
+from collections import OrderedDict
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+def mask_bytes(mask):
+    w, h = mask.get_size()
+    return (w * h + 7) // 8 # One bit per pixel
+
+def tileset_breakdown(tileset):
+    # Bytes held by one Tileset, split by what they're for
+    return {
+        "tiles": sum(surface_bytes(t) for t in tileset.tiles),
+        "zoom_levels": tileset.cache.used_bytes,
+        "masks": sum(mask_bytes(m) for m in tileset.masks),
+    }
+
+def frames_bytes(frames):
+    return sum(surface_bytes(f) for row in frames for f in row)
+
+class AssetRegistry:
+    def __init__(self, budget_bytes=32 * 1024 * 1024):
+        self.budget_bytes = budget_bytes # Cap for cached tilesets and their zoom levels
+        self.tilesets = OrderedDict() # {key: Tileset}, least recently used first
+        self.characters = {} # {(sheet, size): frames}, shared by every character on that sheet
+
+    def set_budget(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._evict(keep=next(reversed(self.tilesets), None))
+
+    def get_tileset(self, key, loader):
+        tileset = self.tilesets.get(key)
+        if tileset is None:
+            tileset = loader()
+            self.tilesets[key] = tileset
+            # Zoom levels built later count against the same budget
+            tileset.cache.on_grow = lambda: self._touch(key)
+        else:
+            self.tilesets.move_to_end(key)
+        self._evict(keep=key)
+        return tileset
+
+    def get_character(self, key, loader):
+        frames = self.characters.get(key)
+        if frames is None:
+            frames = loader()
+            self.characters[key] = frames
+        return frames
+
+    def tilesets_bytes(self):
+        return sum(sum(tileset_breakdown(t).values()) for t in self.tilesets.values())
+
+    def _touch(self, key):
+        if key in self.tilesets:
+            self.tilesets.move_to_end(key)
+            self._evict(keep=key)
+
+    def _evict(self, keep):
+        # Least recently used tilesets go first, the one in use is never evicted
+        for key in list(self.tilesets):
+            if self.tilesets_bytes() <= self.budget_bytes:
+                return
+            if key != keep:
+                del self.tilesets[key]
+        # Still over: shed the kept tileset's other zoom levels (and its source root),
+        # only the levels being drawn or waited for stay
+        tileset = self.tilesets.get(keep)
+        over = self.tilesets_bytes() - self.budget_bytes
+        if tileset and over > 0:
+            tileset.cache.trim(over)
+
+    def report(self):
+        tilesets = {f"{key[0]} @{key[2]}px": tileset_breakdown(t) for key, t in self.tilesets.items()}
+        characters = {f"{key[0]} @{key[1][0]}x{key[1][1]}": frames_bytes(frames) for key, frames in self.characters.items()}
+        total = sum(sum(b.values()) for b in tilesets.values()) + sum(characters.values())
+        return {
+            "budget": self.budget_bytes,
+            "total": total,
+            "tilesets": tilesets,
+            "characters": characters,
+        }
+
+    def dump(self):
+        report = self.report()
+        kb = lambda n: f"{n / 1024:8.1f} KB"
+        print(f"\n--- ASSETS {kb(report['total'])} (tileset budget {kb(report['budget'])}) ---")
+        for name, parts in report["tilesets"].items():
+            print(f"tileset   {kb(sum(parts.values()))}  {name}")
+            for part, size in parts.items():
+                print(f"  {part:<13}{kb(size)}")
+        for name, size in report["characters"].items():
+            print(f"character {kb(size)}  {name}")
+
+# Shared by the map engine and characters
+registry = AssetRegistry()
@@ -0,0 +1,140 @@
+import os
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+
+CHUNK_TILES = 16 # Chunks are 16x16 tiles
+LAYER_ORDER = ["ground", "path", "item"]
+
+def render_cells(surface, tiles, size, layers, width, x0, y0, x1, y1, ox=0, oy=0):
+    # Blit cells [x0, x1) x [y0, y1) of each layer (flat lists, width wide) in one blits call
+    blits = []
+    count = len(tiles)
+    for data in layers:
+        for y in range(y0, y1):
+            row = y * width
+            for x in range(x0, x1):
+                tile_index = data[row + x]
+                if 0 <= tile_index < count:
+                    blits.append((tiles[tile_index], (ox + x * size, oy + y * size)))
+    surface.blits(blits, doreturn=False)
+
+def _render_chunk(tiles, size, layers, width, height):
+    # Runs on a worker thread, pygame drops the GIL while blitting
+    chunk = pygame.Surface((width * size, height * size), pygame.SRCALPHA)
+    render_cells(chunk, tiles, size, layers, width, 0, 0, width, height)
+    return chunk
+
+class ChunkRenderer:
+    def __init__(self, map_engine, chunk_tiles=CHUNK_TILES, workers=None):
+        self.map_engine = map_engine
+        self.chunk_tiles = chunk_tiles
+        workers = workers or min(4, os.cpu_count() or 1)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ChunkRenderer")
+        self.max_in_flight = workers * 2 # Small queue so priorities follow the viewport
+        self.size = None # Tile px the chunks are rendered at
+        self.tiles = None # Tile list they are rendered from
+        self.surfaces = {} # {(cx, cy): Surface} ready to blit
+        self.versions = {} # {(cx, cy): int}, bumped whenever a chunk goes stale
+        self.jobs = {} # {(cx, cy): (version, future)} in flight
+
+    def _layers(self):
+        return [self.map_engine.layers[name] for name in LAYER_ORDER if self.map_engine.layers[name]]
+
+    def _grid(self):
+        # Map size in tiles and in chunks
+        layers = self._layers()
+        if not layers:
+            return 0, 0, 0, 0
+        width, height = layers[0].width, layers[0].height
+        ct = self.chunk_tiles
+        return width, height, (width + ct - 1) // ct, (height + ct - 1) // ct
+
+    def _bounds(self, key, width, height):
+        ct = self.chunk_tiles
+        x0, y0 = key[0] * ct, key[1] * ct
+        return x0, y0, min(x0 + ct, width), min(y0 + ct, height)
+
+    def invalidate(self):
+        # Everything is stale (new layer data, tileset or zoom), draw falls back to tiles until redone
+        for key in set(self.surfaces) | set(self.jobs) | set(self.versions):
+            self.versions[key] = self.versions.get(key, 0) + 1
+        self.surfaces = {}
+
+    def update_cell(self, grid_x, grid_y):
+        key = (grid_x // self.chunk_tiles, grid_y // self.chunk_tiles)
+        chunk = self.surfaces.get(key)
+        if chunk is not None and key not in self.jobs:
+            # Single edits are patched in place, no need to re-render the chunk
+            width, height, _, _ = self._grid()
+            x0, y0, _, _ = self._bounds(key, width, height)
+            size = self.size
+            chunk.fill((0, 0, 0, 0), ((grid_x - x0) * size, (grid_y - y0) * size, size, size))
+            render_cells(chunk, self.tiles, size, [layer.data for layer in self._layers()], width,
+                         grid_x, grid_y, grid_x + 1, grid_y + 1, -x0 * size, -y0 * size)
+        else:
+            self.versions[key] = self.versions.get(key, 0) + 1
+            self.surfaces.pop(key, None)
+
+    def _collect(self):
+        # Swap in finished chunks, drop results that went stale while rendering
+        for key, (version, future) in list(self.jobs.items()):
+            if not future.done():
+                continue
+            del self.jobs[key]
+            if version == self.versions.get(key, 0) and future.exception() is None:
+                self.surfaces[key] = future.result()
+
+    def _schedule(self, width, height, chunks_w, chunks_h, center):
+        if len(self.jobs) >= self.max_in_flight:
+            return
+        missing = [
+            (cx, cy) for cy in range(chunks_h) for cx in range(chunks_w)
+            if (cx, cy) not in self.surfaces and (cx, cy) not in self.jobs
+        ]
+        # Nearest to the viewport first
+        missing.sort(key=lambda key: (key[0] + 0.5 - center[0]) ** 2 + (key[1] + 0.5 - center[1]) ** 2)
+        layers = self._layers()
+        for key in missing[:self.max_in_flight - len(self.jobs)]:
+            x0, y0, x1, y1 = self._bounds(key, width, height)
+            # Snapshot the chunk's cells, the main thread keeps editing the live layers
+            snapshot = [
+                [layer.data[y * layer.width + x] for y in range(y0, y1) for x in range(x0, x1)]
+                for layer in layers
+            ]
+            future = self.pool.submit(_render_chunk, self.tiles, self.size, snapshot, x1 - x0, y1 - y0)
+            self.jobs[key] = (self.versions.get(key, 0), future)
+
+    def draw(self, surface, size, tiles, offset=(0, 0)):
+        if size != self.size or tiles is not self.tiles:
+            self.size, self.tiles = size, tiles
+            self.invalidate()
+        self._collect()
+
+        width, height, chunks_w, chunks_h = self._grid()
+        if not chunks_w:
+            return
+        ox, oy = offset
+        sw, sh = surface.get_size()
+        chunk_px = self.chunk_tiles * size
+        cx0, cy0 = max(0, -ox // chunk_px), max(0, -oy // chunk_px)
+        cx1 = min(chunks_w, (sw - ox) // chunk_px + 1)
+        cy1 = min(chunks_h, (sh - oy) // chunk_px + 1)
+
+        layers = None
+        for cy in range(cy0, cy1):
+            for cx in range(cx0, cx1):
+                chunk = self.surfaces.get((cx, cy))
+                if chunk is not None:
+                    surface.blit(chunk, (ox + cx * chunk_px, oy + cy * chunk_px))
+                else:
+                    # Not ready yet: draw this chunk's tiles directly rather than wait
+                    if layers is None:
+                        layers = [layer.data for layer in self._layers()]
+                    x0, y0, x1, y1 = self._bounds((cx, cy), width, height)
+                    render_cells(surface, tiles, size, layers, width, x0, y0, x1, y1, ox, oy)
+
+        center = (((sw / 2) - ox) / chunk_px, ((sh / 2) - oy) / chunk_px)
+        self._schedule(width, height, chunks_w, chunks_h, center)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,98 @@
+import pygame
+
+# Items that are just decorations (Flowers, Grass tufts)
+WALKABLE_DECORATIONS = [8, 9, 10, 11, 32, 33]
+
+def is_blocking(tile_index):
+    return tile_index != -1 and tile_index not in WALKABLE_DECORATIONS
+
+# Two collision models live side by side:
+# - CollisionMap (below) is pixel exact, built from each blocking tile's alpha mask.
+#   Only the Hero uses it.
+# - MapEngine.is_walkable and is_blocking treat a blocking item as a whole solid tile.
+#   NPCs in EntitySystem, NavGrid and validate_levels.py all use this coarser rule,
+#   so Sara can squeeze past item edges that they route around.
+class CollisionMap:
+    def __init__(self, map_engine):
+        self.map_engine = map_engine
+        self.mask = None # Whole level in pixels, built lazily from the item layer
+        self.boxes = {} # {(w, h): filled mask} reused for hero queries
+
+    def invalidate(self):
+        self.mask = None
+
+    def _build(self):
+        engine = self.map_engine
+        layer = engine.layers["item"]
+        if layer:
+            size = (layer.width * engine.tile_size, layer.height * engine.tile_size)
+        else:
+            size = (800, 800)
+        self.mask = pygame.Mask(size)
+        if layer:
+            for y in range(layer.height):
+                for x in range(layer.width):
+                    self._stamp(x, y, layer.get_tile_index(x, y))
+
+    def _stamp(self, grid_x, grid_y, tile_index):
+        if not is_blocking(tile_index):
+            return
+        tile_mask = self.map_engine.tileset.get_mask(tile_index)
+        if tile_mask:
+            ts = self.map_engine.tile_size
+            self.mask.draw(tile_mask, (grid_x * ts, grid_y * ts))
+
+    def update_cell(self, grid_x, grid_y, tile_index):
+        # Patch one cell instead of rebuilding the level mask
+        if self.mask is None:
+            return
+        ts = self.map_engine.tile_size
+        self.mask.erase(self._box((ts, ts)), (grid_x * ts, grid_y * ts))
+        self._stamp(grid_x, grid_y, tile_index)
+
+    def get_mask(self):
+        if self.mask is None:
+            self._build()
+        return self.mask
+
+    def _box(self, size):
+        box = self.boxes.get(size)
+        if box is None:
+            box = pygame.Mask(size, fill=True)
+            self.boxes[size] = box
+        return box
+
+    def overlaps(self, rect):
+        # Single mask query, leaving the level counts as a hit
+        mask = self.get_mask()
+        if not mask.get_rect().contains(rect):
+            return True
+        return mask.overlap(self._box(rect.size), rect.topleft) is not None
+
+    def sweep(self, rect, dx, dy):
+        # How far rect can travel along one axis (dx or dy, not both) without tunnelling.
+        # The whole swept area is one query, we only bisect when it actually hits something.
+        step = dx or dy
+        if step == 0:
+            return 0
+        sign = 1 if step > 0 else -1
+
+        def blocked(dist):
+            moved = rect.move(sign * dist, 0) if dx else rect.move(0, sign * dist)
+            return self.overlaps(rect.union(moved))
+
+        if not blocked(abs(step)):
+            return step
+        if self.overlaps(rect):
+            # Already overlapping (e.g. spawned inside an item): only check the destination
+            moved = rect.move(dx, dy)
+            return 0 if self.overlaps(moved) else step
+
+        lo, hi = 0, abs(step) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if blocked(mid):
+                hi = mid - 1
+            else:
+                lo = mid
+        return sign * lo
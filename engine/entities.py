@@ -0,0 +1,121 @@
+import pygame
+from array import array
+from engine.assets import registry
+
+def load_character_frames(filename, scale_size=(96, 96), colorkey=(251, 250, 251)):
+    # Returns frames[direction][frame], 4 rows (Down, Up, Right, Left), 3 columns.
+    # Sliced + scaled once per (sheet, size) and shared by every character using that sheet
+    return registry.get_character((filename, scale_size), lambda: _slice_frames(filename, scale_size, colorkey))
+
+def _slice_frames(filename, scale_size, colorkey):
+    sheet = pygame.image.load(filename).convert()
+    sheet.set_colorkey(colorkey)
+    sheet = sheet.convert_alpha()
+
+    # Manual Bake: Convert colorkey + near-white to absolute transparency to avoid halos during scaling
+    for px in range(sheet.get_width()):
+        for py in range(sheet.get_height()):
+            color = sheet.get_at((px, py))
+            if all(c >= 235 for c in color[:3]):
+                sheet.set_at((px, py), (color[0], color[1], color[2], 0))
+            elif color[:3] == colorkey:
+                sheet.set_at((px, py), (colorkey[0], colorkey[1], colorkey[2], 0))
+
+    sheet_w, sheet_h = sheet.get_size()
+    frame_width = sheet_w // 3 # 213 for the 640px sheet
+    frame_height = sheet_h // 4
+    frames = []
+    for direction in range(4):
+        row = []
+        for frame in range(3):
+            clip_rect = pygame.Rect(frame * frame_width, direction * frame_height, frame_width, frame_height)
+            row.append(pygame.transform.scale(sheet.subsurface(clip_rect), scale_size))
+        frames.append(row)
+    return frames # The full sheet goes out of scope here
+
+class EntitySystem:
+    # Walking direction per facing: 0: Down, 1: Up, 2: Right, 3: Left
+    DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+    def __init__(self):
+        # One slot per character, kept in flat arrays so updates are tight loops
+        self.x = array("f")
+        self.y = array("f")
+        self.direction = array("B")
+        self.frame = array("B")
+        self.timer = array("f")
+        self.moving = array("B")
+        self.speed = array("f")
+        self.controlled = array("B") # 1 = moved from outside (the Hero), still animated here
+        self.frames = [] # Shared frame tables, not copies
+
+    def __len__(self):
+        return len(self.x)
+
+    def spawn(self, frames, x, y, direction=0, speed=2, controlled=False):
+        self.x.append(x)
+        self.y.append(y)
+        self.direction.append(direction)
+        self.frame.append(0)
+        self.timer.append(0)
+        self.moving.append(0)
+        self.speed.append(speed)
+        self.controlled.append(1 if controlled else 0)
+        self.frames.append(frames)
+        return len(self.x) - 1
+
+    def clear(self):
+        self.__init__()
+
+    def update(self, delta_time, map_engine=None, flow_field=None):
+        # Move every non-controlled character, following flow_field if given,
+        # otherwise walking straight and turning around at walls. Then animate all of them.
+        x, y, speed = self.x, self.y, self.speed
+        direction, moving = self.direction, self.moving
+        tile_size = map_engine.tile_size if map_engine else 40
+        for i in range(len(x)):
+            if self.controlled[i]:
+                continue
+            if flow_field:
+                # Feet of a 96px character sit near the bottom of its box
+                dx, dy = flow_field.direction(int((x[i] + 48) // tile_size), int((y[i] + 84) // tile_size))
+            else:
+                dx, dy = self.DIRECTIONS[direction[i]]
+            if dx == 0 and dy == 0:
+                moving[i] = 0
+                continue
+
+            nx, ny = x[i] + dx * speed[i], y[i] + dy * speed[i]
+            if map_engine and not map_engine.is_walkable(nx + 48, ny + 84):
+                if not flow_field:
+                    direction[i] ^= 1 # Down<->Up, Right<->Left
+                moving[i] = 0
+                continue
+            x[i], y[i] = nx, ny
+            moving[i] = 1
+            if dy > 0: direction[i] = 0
+            elif dy < 0: direction[i] = 1
+            elif dx > 0: direction[i] = 2
+            else: direction[i] = 3
+
+        self.animate(delta_time)
+
+    def animate(self, delta_time):
+        frame, timer, moving = self.frame, self.timer, self.moving
+        for i in range(len(frame)):
+            if moving[i]:
+                timer[i] += delta_time
+                if timer[i] > 150: # Faster animation for smoother walking
+                    frame[i] = (frame[i] + 1) % 3
+                    timer[i] = 0
+            else:
+                frame[i] = 0 # Reset to idle/standing frame
+
+    def draw(self, surface):
+        # Painter's order: lower on screen is drawn later, so it overlaps correctly
+        x, y, direction, frame, frames = self.x, self.y, self.direction, self.frame, self.frames
+        blits = [
+            (frames[i][direction[i]][frame[i]], (int(x[i]), int(y[i]) - 10)) # Offset a bit for depth
+            for i in sorted(range(len(x)), key=y.__getitem__)
+        ]
+        surface.blits(blits, doreturn=False)
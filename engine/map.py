@@ -1,26 +1,39 @@
 import pygame
+from engine.collision import CollisionMap, WALKABLE_DECORATIONS
+from engine.tile_cache import TileCache
+from engine.navigation import NavGrid
+from engine.assets import registry
+from engine.chunks import ChunkRenderer
 
 class Tileset:
     def __init__(self, filename, source_size=80, target_size=20, colorkey=None):
         self.filename = filename
         self.source_size = source_size
         self.target_size = target_size
-        self.image = pygame.image.load(filename).convert_alpha()
-        if colorkey:
-            self.image.set_colorkey(colorkey)
+        self.colorkey = colorkey
             
         self.tiles = []
+        self.masks = [] # Pixel collision mask per tile, from the cleaned alpha
         self._load_tiles()
+        # Zoom levels shrink self.tiles; zooming in past tile_size re-slices the sheet once
+        # into an 80px root level that stays resident until the asset budget evicts it
+        self.cache = TileCache(self.tiles, load_source=self.load_source_tiles, source_size=source_size)
 
-    def _load_tiles(self):
-        width, height = self.image.get_size()
+    def load_source_tiles(self):
+        # Cleaned tiles at source_size. The sheet itself is dropped when this returns.
+        image = pygame.image.load(self.filename).convert_alpha()
+        if self.colorkey:
+            image.set_colorkey(self.colorkey)
+
+        source_tiles = []
+        width, height = image.get_size()
         for y in range(0, height, self.source_size):
             for x in range(0, width, self.source_size):
                 rect = pygame.Rect(x, y, self.source_size, self.source_size)
                 try:
                     # Create a clean alpha surface for the tile
                     tile = pygame.Surface((self.source_size, self.source_size), pygame.SRCALPHA)
-                    tile.blit(self.image, (0, 0), rect)
+                    tile.blit(image, (0, 0), rect)
                     
                     # ULTIMATE PURGE: Target ANY grid/background artifact
                     # We kill anything bright and neutral (Grey/White/Grid)
@@ -41,18 +54,28 @@ class Tileset:
                             
                             if (is_neutral and is_bright) or (is_at_border and brightness > 180):
                                 tile.set_at((px, py), (0, 0, 0, 0))
-                    
-                    # Scale to target size (40px)
-                    scaled_tile = pygame.transform.scale(tile, (self.target_size, self.target_size))
-                    self.tiles.append(scaled_tile)
+                    source_tiles.append(tile)
                 except Exception as e:
                     print(f"Error loading tile at {x},{y}: {e}")
+        return source_tiles
+
+    def _load_tiles(self):
+        for tile in self.load_source_tiles():
+            # Scale to target size (40px), the 80px source tile isn't kept
+            scaled_tile = pygame.transform.scale(tile, (self.target_size, self.target_size))
+            self.tiles.append(scaled_tile)
+            self.masks.append(pygame.mask.from_surface(scaled_tile))
 
     def get_tile(self, index):
         if 0 <= index < len(self.tiles):
             return self.tiles[index]
         return None
 
+    def get_mask(self, index):
+        if 0 <= index < len(self.masks):
+            return self.masks[index]
+        return None
+
 class MapLayer:
     def __init__(self, data, width=20, height=20):
         self.data = data # List of indices
@@ -66,21 +89,37 @@ class MapLayer:
 
 class MapEngine:
     def __init__(self, tileset_path, tile_size=20, colorkey=(255, 255, 255)):
-        self.tileset = Tileset(tileset_path, source_size=80, target_size=tile_size, colorkey=colorkey)
+        self.tile_size = tile_size
+        self.tileset = self._get_tileset(tileset_path, colorkey)
         self.layers = {
             "ground": None,
             "path": None,
             "item": None
         }
-        self.tile_size = tile_size
         self.special_objects = {} # {(grid_x, grid_y): image}
+        self.scaled_objects = {} # {(grid_x, grid_y, tile_px): image} for zoomed draws
+        self.dirty_cells = {} # {layer_name: {cell_index: tile_index}} since last save
+        self.collision = CollisionMap(self)
+        self.navigation = NavGrid(self)
+        self.chunks = ChunkRenderer(self)
 
     def set_layer(self, layer_name, data, width=20, height=20):
         if layer_name in self.layers:
             self.layers[layer_name] = MapLayer(data, width, height)
+            self.dirty_cells.pop(layer_name, None)
+            self.chunks.invalidate()
+            if layer_name == "item":
+                self.collision.invalidate()
+                self.navigation.invalidate()
+
+    def _get_tileset(self, tileset_path, colorkey):
+        # Tilesets are cached in the asset registry, so going back to a level doesn't re-slice it
+        key = (tileset_path, tuple(colorkey) if colorkey else None, self.tile_size)
+        return registry.get_tileset(key, lambda: Tileset(tileset_path, source_size=80, target_size=self.tile_size, colorkey=colorkey))
 
     def switch_tileset(self, tileset_path, colorkey=(255, 255, 255)):
-        self.tileset = Tileset(tileset_path, source_size=80, target_size=self.tile_size, colorkey=colorkey)
+        self.tileset = self._get_tileset(tileset_path, colorkey)
+        self.collision.invalidate()
 
     def add_object(self, grid_x, grid_y, image_path, crop_rect=None):
         try:
@@ -120,11 +159,13 @@ class MapEngine:
             
             img = pygame.transform.scale(img, (int(scale_w), int(scale_h)))
             self.special_objects[(grid_x, grid_y)] = img
+            self.scaled_objects = {k: v for k, v in self.scaled_objects.items() if k[:2] != (grid_x, grid_y)}
         except Exception as e:
             print(f"Error adding object {image_path}: {e}")
 
     def clear_objects(self):
         self.special_objects = {}
+        self.scaled_objects = {}
 
     def get_item_at(self, pixel_x, pixel_y):
         layer = self.layers["item"]
@@ -139,9 +180,6 @@ class MapEngine:
         if pixel_x < 0 or pixel_x >= 800 or pixel_y < 0 or pixel_y >= 800:
             return False
             
-        # Define items that are just decorations (Flowers, Grass tufts)
-        WALKABLE_DECORATIONS = [8, 9, 10, 11, 32, 33]
-        
         item_idx = self.get_item_at(pixel_x, pixel_y)
         if item_idx == -1 or item_idx in WALKABLE_DECORATIONS:
             return True
@@ -150,7 +188,21 @@ class MapEngine:
     def update_tile(self, layer_name, grid_x, grid_y, tile_index):
         layer = self.layers.get(layer_name)
         if layer and 0 <= grid_x < layer.width and 0 <= grid_y < layer.height:
-            layer.data[grid_y * layer.width + grid_x] = tile_index
+            idx = grid_y * layer.width + grid_x
+            old_index = layer.data[idx]
+            if old_index != tile_index:
+                layer.data[idx] = tile_index
+                self.dirty_cells.setdefault(layer_name, {})[idx] = tile_index
+                self.chunks.update_cell(grid_x, grid_y)
+                if layer_name == "item":
+                    self.collision.update_cell(grid_x, grid_y, tile_index)
+                    self.navigation.update_cell(grid_x, grid_y, old_index, tile_index)
+
+    def pop_dirty_cells(self):
+        # Hand over the cells changed since the last save and start tracking afresh
+        changes = self.dirty_cells
+        self.dirty_cells = {}
+        return changes
 
     def get_layer_data(self, layer_name):
         layer = self.layers.get(layer_name)
@@ -158,19 +210,26 @@ class MapEngine:
             return list(layer.data)
         return []
 
-    def draw(self, surface):
-        for layer_name in ["ground", "path", "item"]:
-            layer = self.layers[layer_name]
-            if layer:
-                for y in range(layer.height):
-                    for x in range(layer.width):
-                        tile_index = layer.get_tile_index(x, y)
-                        if tile_index >= 0:
-                            tile_image = self.tileset.get_tile(tile_index)
-                            if tile_image:
-                                # Ensure integer alignment for sharp rendering
-                                surface.blit(tile_image, (int(x * self.tile_size), int(y * self.tile_size)))
+    def draw(self, surface, zoom=1.0, offset=(0, 0)):
+        # Tiles come pre-scaled from the tileset cache and are composited into
+        # chunks on worker threads, nothing is resized or re-tiled per frame.
+        # A zoom level that isn't built yet is drawn with the nearest resident one meanwhile.
+        size, tiles = self.tileset.cache.get_level(zoom)
+        ox, oy = offset
+        self.chunks.draw(surface, size, tiles, offset)
         
         # Draw Special Objects
         for (gx, gy), img in self.special_objects.items():
-            surface.blit(img, (int(gx * self.tile_size), int(gy * self.tile_size)))
+            if size != self.tile_size:
+                img = self._scaled_object(gx, gy, img, size)
+            surface.blit(img, (int(ox + gx * size), int(oy + gy * size)))
+
+    def _scaled_object(self, grid_x, grid_y, img, size):
+        key = (grid_x, grid_y, size)
+        scaled = self.scaled_objects.get(key)
+        if scaled is None:
+            factor = size / self.tile_size
+            w, h = img.get_size()
+            scaled = pygame.transform.smoothscale(img, (max(1, int(w * factor)), max(1, int(h * factor))))
+            self.scaled_objects[key] = scaled
+        return scaled
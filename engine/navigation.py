@@ -0,0 +1,143 @@
+import heapq
+from collections import deque
+from engine.collision import is_blocking
+
+# 4-way moves, same as the hero
+NEIGHBOURS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+class FlowField:
+    def __init__(self, goals, width, height, dist, next_cell):
+        self.goals = goals
+        self.width = width
+        self.height = height
+        self.dist = dist # Steps to the nearest goal per cell, -1 if unreachable
+        self.next_cell = next_cell # Index of the cell to step into, -1 at goals / unreachable
+
+    def distance(self, grid_x, grid_y):
+        if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
+            return self.dist[grid_y * self.width + grid_x]
+        return -1
+
+    def direction(self, grid_x, grid_y):
+        # (dx, dy) to follow from this cell, (0, 0) at a goal or when stuck
+        if not (0 <= grid_x < self.width and 0 <= grid_y < self.height):
+            return (0, 0)
+        nxt = self.next_cell[grid_y * self.width + grid_x]
+        if nxt == -1:
+            return (0, 0)
+        return (nxt % self.width - grid_x, nxt // self.width - grid_y)
+
+class NavGrid:
+    def __init__(self, map_engine):
+        self.map_engine = map_engine
+        self.walkable = None # Flat list of bools per cell, built lazily from the item layer
+        self.width = 0
+        self.height = 0
+        self.flow_fields = {} # {goals: FlowField}, shared by every agent heading there
+
+    def invalidate(self):
+        self.walkable = None
+        self.flow_fields = {}
+
+    def update_cell(self, grid_x, grid_y, old_index, new_index):
+        # Only a change in walkability makes the cached fields stale
+        if self.walkable is None or is_blocking(old_index) == is_blocking(new_index):
+            return
+        self.walkable[grid_y * self.width + grid_x] = not is_blocking(new_index)
+        self.flow_fields = {}
+
+    def _build(self):
+        layer = self.map_engine.layers["item"]
+        if layer:
+            self.width, self.height = layer.width, layer.height
+            self.walkable = [not is_blocking(idx) for idx in layer.data]
+        else:
+            self.width, self.height = 20, 20
+            self.walkable = [True] * 400
+
+    def is_walkable(self, grid_x, grid_y):
+        if self.walkable is None:
+            self._build()
+        if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
+            return self.walkable[grid_y * self.width + grid_x]
+        return False
+
+    def to_grid(self, pixel_x, pixel_y):
+        ts = self.map_engine.tile_size
+        return int(pixel_x // ts), int(pixel_y // ts)
+
+    def find_path(self, start, goal):
+        # A* for one-off queries, returns grid cells from start to goal or [] if unreachable
+        if self.walkable is None:
+            self._build()
+        if not self.is_walkable(*goal) or not (0 <= start[0] < self.width and 0 <= start[1] < self.height):
+            return []
+
+        width = self.width
+        start_i = start[1] * width + start[0]
+        goal_i = goal[1] * width + goal[0]
+        came_from = {start_i: -1}
+        cost = {start_i: 0}
+        open_heap = [(0, start_i)]
+        while open_heap:
+            _, current = heapq.heappop(open_heap)
+            if current == goal_i:
+                path = []
+                while current != -1:
+                    path.append((current % width, current // width))
+                    current = came_from[current]
+                path.reverse()
+                return path
+            cx, cy = current % width, current // width
+            for dx, dy in NEIGHBOURS:
+                nx, ny = cx + dx, cy + dy
+                if not self.is_walkable(nx, ny):
+                    continue
+                ni = ny * width + nx
+                new_cost = cost[current] + 1
+                if new_cost < cost.get(ni, new_cost + 1):
+                    cost[ni] = new_cost
+                    came_from[ni] = current
+                    # Manhattan distance is exact for 4-way moves with no obstacles
+                    heuristic = abs(nx - goal[0]) + abs(ny - goal[1])
+                    heapq.heappush(open_heap, (new_cost + heuristic, ni))
+        return []
+
+    def get_flow_field(self, *goals):
+        # One BFS per goal set, cached until walkability changes
+        key = tuple(sorted(goals))
+        field = self.flow_fields.get(key)
+        if field is None:
+            field = self._build_flow_field(key)
+            self.flow_fields[key] = field
+        return field
+
+    def _build_flow_field(self, goals):
+        if self.walkable is None:
+            self._build()
+        width, height = self.width, self.height
+        dist = [-1] * (width * height)
+        next_cell = [-1] * (width * height)
+        frontier = deque()
+        for gx, gy in goals:
+            # Goals are seeded even if an item sits on them (portal, trophy)
+            if 0 <= gx < width and 0 <= gy < height:
+                gi = gy * width + gx
+                if dist[gi] == -1:
+                    dist[gi] = 0
+                    frontier.append(gi)
+
+        while frontier:
+            current = frontier.popleft()
+            cx, cy = current % width, current // width
+            for dx, dy in NEIGHBOURS:
+                nx, ny = cx + dx, cy + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                ni = ny * width + nx
+                if dist[ni] != -1 or not self.walkable[ni]:
+                    continue
+                dist[ni] = dist[current] + 1
+                next_cell[ni] = current
+                frontier.append(ni)
+        return FlowField(goals, width, height, dist, next_cell)
@@ -38,6 +38,14 @@ class Particle:
 class ParticleSystem:
     def __init__(self):
         self.particles = []
+        # Set from the quality governor
+        self.max_particles = 1000
+        self.life_scale = 1.0
+
+    def _add(self, particle):
+        if len(self.particles) < self.max_particles:
+            particle.life = particle.max_life = max(1, int(particle.life * self.life_scale))
+            self.particles.append(particle)
 
     def emit_dust(self, x, y):
         # Larger puffs
@@ -47,7 +55,7 @@ class ParticleSystem:
             life = random.randint(20, 40)
             size = random.uniform(4, 8)
             color = (139, 115, 85)
-            self.particles.append(Particle(x, y, dx, dy, life, color, size, friction=0.95))
+            self._add(Particle(x, y, dx, dy, life, color, size, friction=0.95))
 
     def emit_spark(self, x, y, color=(255, 255, 100)):
         # Brighter sparks
@@ -58,7 +66,7 @@ class ParticleSystem:
             dy = math.sin(angle) * speed
             life = random.randint(30, 60)
             size = random.uniform(2, 6)
-            self.particles.append(Particle(x, y, dx, dy, life, color, size, friction=0.98))
+            self._add(Particle(x, y, dx, dy, life, color, size, friction=0.98))
 
     def emit_leaf(self):
         # Green/Orange leaves for 800px width
@@ -69,7 +77,7 @@ class ParticleSystem:
         life = 400 
         size = random.uniform(6, 12)
         color = random.choice([(34, 139, 34), (107, 142, 35), (218, 165, 32)])
-        self.particles.append(Particle(x, y, dx, dy, life, color, size, gravity=0.02, friction=0.99))
+        self._add(Particle(x, y, dx, dy, life, color, size, gravity=0.02, friction=0.99))
 
     def update(self):
         self.particles = [p for p in self.particles if p.update()]
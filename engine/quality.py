@@ -0,0 +1,66 @@
+from collections import deque
+
+# Lowest to highest, HIGH matches the original hand-tuned look
+QUALITY_TIERS = [
+    {"name": "LOW", "emit_scale": 0.25, "life_scale": 0.5, "max_particles": 80, "outline_passes": 0, "pulse": False, "overlay": False},
+    {"name": "MEDIUM", "emit_scale": 0.5, "life_scale": 0.75, "max_particles": 250, "outline_passes": 2, "pulse": False, "overlay": True},
+    {"name": "HIGH", "emit_scale": 1.0, "life_scale": 1.0, "max_particles": 1000, "outline_passes": 4, "pulse": True, "overlay": True},
+]
+
+class QualityGovernor:
+    def __init__(self, target_fps=144, window=60, cooldown=120, tiers=QUALITY_TIERS):
+        self.target_ms = 1000 / target_fps
+        self.tiers = tiers
+        self.tier = len(tiers) - 1 # Start high, step down if the machine can't keep up
+        self.frame_times = deque(maxlen=window) # Rolling window of work time per frame (ms)
+        self.cooldown = cooldown # Frames to wait after a change before judging again
+        self.frames_since_change = 0
+        self.skip_frames = 0 # Samples to ignore, e.g. the frame that loaded a level
+        # Hysteresis: drop when clearly over budget, only climb back when clearly under
+        self.downgrade_at = 1.1
+        self.upgrade_at = 0.6
+
+    @property
+    def settings(self):
+        return self.tiers[self.tier]
+
+    @property
+    def name(self):
+        return self.settings["name"]
+
+    def typical_ms(self):
+        # Median of the window: a single stall (asset load, GC) can't move it
+        if not self.frame_times:
+            return 0
+        ordered = sorted(self.frame_times)
+        return ordered[len(ordered) // 2]
+
+    def reset(self, skip_frames=1):
+        # Forget the window after a one-off stall such as a level load,
+        # including the frame that's still being timed
+        self.frame_times.clear()
+        self.skip_frames = skip_frames
+
+    def record(self, frame_ms):
+        # Feed the time spent on a frame (excluding the fps cap sleep), returns True if the tier changed
+        if self.skip_frames > 0:
+            self.skip_frames -= 1
+            return False
+        self.frame_times.append(frame_ms)
+        self.frames_since_change += 1
+        if self.frames_since_change < self.cooldown or len(self.frame_times) < self.frame_times.maxlen:
+            return False
+
+        typical = self.typical_ms()
+        if typical > self.target_ms * self.downgrade_at and self.tier > 0:
+            self._set_tier(self.tier - 1)
+            return True
+        if typical < self.target_ms * self.upgrade_at and self.tier < len(self.tiers) - 1:
+            self._set_tier(self.tier + 1)
+            return True
+        return False
+
+    def _set_tier(self, tier):
+        self.tier = tier
+        self.frames_since_change = 0
+        self.frame_times.clear() # Old samples were measured at the previous tier
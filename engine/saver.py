@@ -0,0 +1,123 @@
+import os
+import json
+import queue
+import tempfile
+import threading
+
+def journal_path(save_file):
+    # Incremental autosaves live next to the full save
+    root, _ = os.path.splitext(save_file)
+    return f"{root}.autosave.jsonl"
+
+def write_atomic(path, text):
+    # Write to a temp file in the same folder, then rename over the target.
+    # A crash mid-write leaves the old file untouched.
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=folder)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def apply_journal(save_file, layers):
+    # Replay autosaved cell changes on top of the loaded layers
+    path = journal_path(save_file)
+    if not os.path.exists(path):
+        return 0
+    applied = 0
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                patch = json.loads(line)
+            except ValueError:
+                break # Torn last line from a crash, everything before it is good
+            for layer_name, cells in patch.items():
+                data = layers.get(layer_name)
+                if data is None:
+                    continue
+                for idx, tile_index in cells.items():
+                    idx = int(idx)
+                    if 0 <= idx < len(data):
+                        data[idx] = tile_index
+                        applied += 1
+    return applied
+
+class MapSaver:
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.pending = {"full": 0, "patch": 0}
+        self.thread = threading.Thread(target=self._run, name="MapSaver", daemon=True)
+        self.thread.start()
+
+    def save(self, save_file, layers, changes=None):
+        # layers must be a snapshot ({name: list}), the main thread keeps editing the live ones.
+        # changes are the cells edited since the last autosave, journaled if the full save fails.
+        self.pending["full"] += 1
+        self.jobs.put(("full", save_file, (layers, changes)))
+
+    def autosave(self, save_file, changes):
+        # changes: {layer_name: {cell_index: tile_index}} since the last save
+        if not changes:
+            return
+        self.pending["patch"] += 1
+        self.jobs.put(("patch", save_file, changes))
+
+    def is_busy(self, kind="full"):
+        return self.pending[kind] > 0
+
+    def poll(self):
+        # Finished jobs as (kind, save_file, error); call from the main thread
+        done = []
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending[result[0]] -= 1
+            done.append(result)
+        return done
+
+    def close(self):
+        # Flush everything queued so far before the game exits
+        self.jobs.put(None)
+        self.thread.join()
+
+    def _append(self, save_file, changes):
+        with open(journal_path(save_file), "a") as f:
+            f.write(json.dumps(changes) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            kind, save_file, payload = job
+            try:
+                if kind == "full":
+                    layers, changes = payload
+                    try:
+                        write_atomic(save_file, json.dumps(layers))
+                    except Exception:
+                        # Keep the edits crash-safe in the journal. Doing it here, in queue order,
+                        # means later autosaves of the same cells still win on replay.
+                        if changes:
+                            self._append(save_file, changes)
+                        raise
+                    # Full file now contains every change, drop the journal
+                    path = journal_path(save_file)
+                    if os.path.exists(path):
+                        os.remove(path)
+                else:
+                    self._append(save_file, payload)
+                self.results.put((kind, save_file, None))
+            except Exception as e:
+                self.results.put((kind, save_file, e))
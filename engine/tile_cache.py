@@ -0,0 +1,144 @@
+import pygame
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from engine.assets import surface_bytes
+
+# Zoom is snapped to these steps so we only ever keep a handful of tile sizes around
+ZOOM_STEPS = [0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 4.0]
+
+def snap_zoom(zoom):
+    return min(ZOOM_STEPS, key=lambda step: abs(step - zoom))
+
+# One background builder shared by every tileset, zoom changes are rare
+_builder = None
+
+def _get_builder():
+    global _builder
+    if _builder is None:
+        _builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="TileCache")
+    return _builder
+
+def _scale_tiles(parent, size):
+    # Downscales are filtered (mipmap style), upscales stay nearest-neighbour for crisp pixels
+    tiles = []
+    for tile in parent:
+        if tile.get_width() > size:
+            tiles.append(pygame.transform.smoothscale(tile, (size, size)))
+        else:
+            tiles.append(pygame.transform.scale(tile, (size, size)))
+    return tiles
+
+def _build_level(size, parent, load_source):
+    # Runs on the builder thread. Returns (tiles, source tiles if they had to be loaded)
+    source = None
+    if parent is None:
+        source = load_source()
+        parent = source
+    return _scale_tiles(parent, size), source
+
+class TileCache:
+    def __init__(self, base_tiles, load_source=None, source_size=80):
+        self.base_tiles = base_tiles # Tileset.tiles at tile_size, always resident
+        self.load_source = load_source # Returns full resolution tiles (the root of the mip chain)
+        self.source_size = source_size
+        self.base_size = base_tiles[0].get_width() if base_tiles else 0
+        self.levels = OrderedDict() # {tile_px: [tiles]}, least recently used first, may hold the source root
+        self.pending = {} # {tile_px: future} being built in the background
+        self.used_bytes = 0
+        self.in_use = self.base_size # Last size handed to draw, never trimmed
+        self.wanted = self.base_size # Size draw asked for, kept when it lands even if over budget
+        self.on_grow = None # Set by the asset registry so new levels count against its budget
+
+    def level_size(self, zoom):
+        return max(1, round(self.base_size * snap_zoom(zoom)))
+
+    def get_level(self, zoom, wait=False):
+        # Returns (tile_px, tiles) for the zoom step closest to zoom. A missing level is built
+        # on the builder thread; until it lands we hand back the nearest resident level.
+        size = self.level_size(zoom)
+        self.wanted = size
+        self._collect()
+        if size != self.base_size and size not in self.levels:
+            self.request(size)
+            if wait:
+                self.pending[size].result()
+                self._collect()
+        if size == self.base_size or size in self.levels:
+            found = size
+        else:
+            found = min([self.base_size] + list(self.levels), key=lambda s: abs(s - size))
+
+        self.in_use = found
+        if found == self.base_size:
+            return found, self.base_tiles
+        self.levels.move_to_end(found)
+        return found, self.levels[found]
+
+    def prefetch(self, zooms):
+        # Build the levels for zoom steps we know we'll need before they're drawn
+        for zoom in zooms:
+            size = self.level_size(zoom)
+            if size != self.base_size:
+                self.request(size)
+
+    def request(self, size):
+        if size in self.levels or size in self.pending:
+            return
+        # Mipmap chain: scale from the smallest resident level that is bigger,
+        # the source root only has to be loaded (and cleaned) when it isn't resident
+        parents = [s for s in list(self.levels) + [self.base_size] if s > size]
+        if parents:
+            parent_size = min(parents)
+            parent = self.base_tiles if parent_size == self.base_size else self.levels[parent_size]
+        elif self.source_size in self.levels:
+            parent = self.levels[self.source_size]
+        elif self.load_source:
+            parent = None
+        else:
+            parent = self.base_tiles
+        if parent is not None:
+            # smoothscale locks its source, so the builder gets private copies
+            # rather than tiles the main thread is blitting
+            parent = [tile.copy() for tile in parent]
+        self.pending[size] = _get_builder().submit(_build_level, size, parent, self.load_source)
+
+    def _collect(self):
+        for size, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[size]
+            if future.exception() is not None:
+                print(f"Error building {size}px tiles: {future.exception()}")
+                continue
+            tiles, source = future.result()
+            if source is not None and self.source_size not in self.levels:
+                # Keep the root resident so the next zoom in doesn't re-slice the sheet
+                self._add(self.source_size, source)
+            if size not in self.levels:
+                self._add(size, tiles)
+            if self.on_grow:
+                self.on_grow()
+
+    def _add(self, size, tiles):
+        self.levels[size] = tiles
+        self.used_bytes += sum(surface_bytes(t) for t in tiles)
+
+    def trim(self, bytes_to_free):
+        # Drop least recently used levels until bytes_to_free are released, except the
+        # ones being drawn or waited for. The source root can go too, it is reloaded if needed.
+        keep = (self.in_use, self.wanted)
+        freed = 0
+        for size in list(self.levels):
+            if freed >= bytes_to_free:
+                break
+            if size in keep:
+                continue
+            tiles = self.levels.pop(size)
+            size_bytes = sum(surface_bytes(t) for t in tiles)
+            self.used_bytes -= size_bytes
+            freed += size_bytes
+        return freed
+
+    def clear(self):
+        self.levels.clear()
+        self.used_bytes = 0
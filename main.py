@@ -8,11 +8,19 @@ from chars.sara import Hero
 from engine.map import MapEngine
 from engine.level_data import LEVEL_1_FOREST, LEVEL_2_SPACE
 from engine.particles import ParticleSystem
+from engine.entities import EntitySystem
+from engine.assets import registry
+from engine.quality import QualityGovernor
+from engine.saver import MapSaver, apply_journal
+
+AUTOSAVE_INTERVAL = 5000 # ms between incremental autosaves
+SAVE_FEEDBACK_TIME = 1000 # ms the "SAVED!" banner stays up after a save lands
 
 class Saraadventure(object):
     def __init__(self):
         pygame.init()
-        self.screen = pygame.display.set_mode((800, 800))
+        # SCALED lets SDL stretch the 800x800 frame to any window size on the GPU
+        self.screen = pygame.display.set_mode((800, 800), pygame.SCALED | pygame.RESIZABLE)
         try:
             self.icon = pygame.image.load("assets/my_icon.png")
             pygame.display.set_icon(self.icon)
@@ -22,8 +30,10 @@ class Saraadventure(object):
         self.font = pygame.font.SysFont("knit", 24)
         self.big_font = pygame.font.SysFont("knit", 42)
         self.clock = pygame.time.Clock()
+        self.saver = MapSaver()
         pygame.display.set_caption(self.caption)
         self.running = True
+        self.quality = QualityGovernor(target_fps=144)
         self.game_state = "PLAYING" # PLAYING, WON
         self.current_level = 1
         
@@ -31,14 +41,17 @@ class Saraadventure(object):
         self.map_engine = MapEngine(LEVEL_1_FOREST["tileset"], tile_size=40, colorkey=LEVEL_1_FOREST["colorkey"])
         self.load_level(LEVEL_1_FOREST)
         
-        self.hero = Hero("Sara", "assets/sara/sara_spritesheet.png", self.start_x, self.start_y)
+        self.entities = EntitySystem()
+        self.hero = Hero("Sara", "assets/sara/sara_spritesheet.png", self.start_x, self.start_y, self.entities)
         self.particles = ParticleSystem()
+        self.apply_quality()
         
         # Editor State
         self.mode = "GAME" # "GAME" or "EDITOR"
         self.selected_tile = 0
         self.palette_scroll = 0
-        self.save_feedback_timer = 0
+        self.save_feedback_until = 0
+        self.last_autosave = 0
 
     def load_level(self, level_config):
         self.map_engine.switch_tileset(level_config["tileset"], colorkey=level_config.get("colorkey"))
@@ -53,11 +66,21 @@ class Saraadventure(object):
             except Exception as e:
                 print(f"Error loading {save_file}: {e}")
 
+        layers = {}
         for layer_name, data in level_config["layers"].items():
             if custom_data and layer_name in custom_data:
-                self.map_engine.set_layer(layer_name, custom_data[layer_name])
+                layers[layer_name] = list(custom_data[layer_name])
             else:
-                self.map_engine.set_layer(layer_name, data)
+                layers[layer_name] = list(data)
+
+        # Replay edits autosaved after the last full save
+        try:
+            apply_journal(save_file, layers)
+        except Exception as e:
+            print(f"Error replaying autosave for {save_file}: {e}")
+
+        for layer_name, data in layers.items():
+            self.map_engine.set_layer(layer_name, data)
                 
         self.start_x, self.start_y = level_config["start_pos"]
         
@@ -72,11 +95,21 @@ class Saraadventure(object):
             tx, ty = level_config["trophy_pos"]
             self.map_engine.add_object(tx, ty, level_config["trophy_img"])
 
+        # Loading stalls the frame, that's not what the governor should judge rendering by
+        self.quality.reset()
+
     def restart_game(self):
+        self.autosave()
         self.game_state = "PLAYING"
         self.current_level = 1
         self.load_level(LEVEL_1_FOREST)
         self.hero.rect.x, self.hero.rect.y = self.start_x, self.start_y
+        self.hero.sync()
+
+    def apply_quality(self):
+        quality = self.quality.settings
+        self.particles.max_particles = quality["max_particles"]
+        self.particles.life_scale = quality["life_scale"]
 
     def drow_text(self, text, position, color=(255, 255, 255), font_type="small", center=False, scale=1.0):
         # Handle Scaling for pulse effect
@@ -90,6 +123,10 @@ class Saraadventure(object):
         else:
             base_font = self.font
 
+        # Pulsing is a smoothscale per frame, skip it on lower quality tiers
+        if not self.quality.settings["pulse"]:
+            scale = 1.0
+
         # Render original text surface
         text_surface = base_font.render(text, True, color)
         if scale != 1.0:
@@ -103,14 +140,15 @@ class Saraadventure(object):
         else:
             pos = position
 
-        # Draw Outline
+        # Draw Outline (fewer passes on lower quality tiers)
         outline_color = (0, 0, 0)
-        offsets = [(-2, -2), (2, -2), (-2, 2), (2, 2)]
-        for ox, oy in offsets:
+        offsets = [(-2, -2), (2, 2), (2, -2), (-2, 2)][:self.quality.settings["outline_passes"]]
+        if offsets:
             outline_surf = base_font.render(text, True, outline_color)
             if scale != 1.0:
                 outline_surf = pygame.transform.smoothscale(outline_surf, (int(w * scale), int(h * scale)))
-            self.screen.blit(outline_surf, (pos[0] + ox, pos[1] + oy))
+            for ox, oy in offsets:
+                self.screen.blit(outline_surf, (pos[0] + ox, pos[1] + oy))
             
         self.screen.blit(text_surface, pos)
     
@@ -124,10 +162,12 @@ class Saraadventure(object):
             px, py = LEVEL_1_FOREST["portal_pos"]
             # Check for proximity to portal center
             if abs(cx - px) < 1.5 and abs(cy - py) < 1.5:
+                self.autosave() # Keep level 1 edits before its layers are replaced
                 self.current_level = 2
                 self.load_level(LEVEL_2_SPACE)
                 # Ensure spawn is in 800x800 space (start_pos is logical 0-400)
                 self.hero.rect.x, self.hero.rect.y = self.start_x * 2, self.start_y * 2
+                self.hero.sync() # Teleported, don't draw her one frame at the old spot
             
         elif self.current_level == 2:
             tx, ty = LEVEL_2_SPACE["trophy_pos"]
@@ -135,20 +175,32 @@ class Saraadventure(object):
                 self.game_state = "WON"
 
     def save_map(self):
-        # Save current map structure to a JSON file
+        # Snapshot the layers and let the writer thread do the JSON + disk work
         save_file = f"level_{self.current_level}_custom.json"
         map_data = {
             "ground": self.map_engine.get_layer_data("ground"),
             "path": self.map_engine.get_layer_data("path"),
             "item": self.map_engine.get_layer_data("item")
         }
-        try:
-            with open(save_file, "w") as f:
-                json.dump(map_data, f)
-            self.save_feedback_timer = 60 
-            print(f"\n--- MAP SAVED TO {save_file} ---")
-        except Exception as e:
-            print(f"Error saving map: {e}")
+        # The snapshot has these too; the saver journals them if the full write fails
+        changes = self.map_engine.pop_dirty_cells()
+        self.saver.save(save_file, map_data, changes)
+        self.last_autosave = pygame.time.get_ticks()
+
+    def autosave(self):
+        # Persist only the cells changed since the last save
+        changes = self.map_engine.pop_dirty_cells()
+        if changes:
+            self.saver.autosave(f"level_{self.current_level}_custom.json", changes)
+        self.last_autosave = pygame.time.get_ticks()
+
+    def check_saves(self):
+        for kind, save_file, error in self.saver.poll():
+            if error:
+                print(f"Error saving map to {save_file}: {error} (edits kept in the autosave journal)")
+            elif kind == "full":
+                self.save_feedback_until = pygame.time.get_ticks() + SAVE_FEEDBACK_TIME
+                print(f"\n--- MAP SAVED TO {save_file} ---")
 
     def headle_input(self):
         keys = pygame.key.get_pressed()
@@ -182,10 +234,15 @@ class Saraadventure(object):
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
+                    self.autosave()
+                    self.saver.close()
+                    self.map_engine.chunks.shutdown()
                     pygame.quit()
                     sys.exit()
                 
                 if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F9:
+                        registry.dump() # Debug: what's resident right now
                     if event.key == pygame.K_TAB:
                         self.mode = "EDITOR" if self.mode == "GAME" else "GAME"
                     if self.mode == "EDITOR":
@@ -227,42 +284,49 @@ class Saraadventure(object):
                             self.map_engine.update_tile("path", gx, gy, -1)
                             self.map_engine.update_tile("item", gx, gy, -1)
             
+            self.check_saves()
+            if current_time - self.last_autosave > AUTOSAVE_INTERVAL:
+                self.autosave()
+
             bg_color = (25, 100, 25) if self.current_level == 1 else (5, 5, 30)
             self.screen.fill(bg_color)
             
             self.map_engine.draw(self.screen)
             
             if self.game_state == "PLAYING":
-                self.hero.update(elapsed_time)
+                self.hero.update()
+                self.entities.update(elapsed_time, self.map_engine)
                 self.check_interaction()
                 
                 # Update and trigger particles
                 self.particles.update()
                 
+                emit_scale = self.quality.settings["emit_scale"]
+
                 # 1. Dust Trail
-                if self.hero.is_moving:
+                if self.hero.is_moving and random.random() < emit_scale:
                     self.particles.emit_dust(self.hero.rect.centerx, self.hero.rect.bottom - 5)
                 
                 # 2. Level Ambience/Objectives
                 if self.current_level == 1:
-                    if random.random() < 0.05: # Falling leaves
+                    if random.random() < 0.05 * emit_scale: # Falling leaves
                         self.particles.emit_leaf()
                     
                     # Portal sparks
                     px, py = LEVEL_1_FOREST["portal_pos"]
-                    if random.random() < 0.3:
+                    if random.random() < 0.3 * emit_scale:
                         msg_x = px * 40 + random.randint(0, 80)
                         msg_y = py * 40 + random.randint(0, 80)
                         self.particles.emit_spark(msg_x, msg_y, color=(150, 100, 255))
                 else:
                     # Space Trophy sparks
                     tx, ty = LEVEL_2_SPACE["trophy_pos"]
-                    if random.random() < 0.3:
+                    if random.random() < 0.3 * emit_scale:
                         msg_x = tx * 40 + random.randint(0, 80)
                         msg_y = ty * 40 + random.randint(0, 80)
                         self.particles.emit_spark(msg_x, msg_y, color=(255, 215, 0))
             
-            self.hero.draw(self.screen)
+            self.entities.draw(self.screen) # Sara and any other characters, depth sorted
             self.particles.draw(self.screen)
             
             # --- HUD (Scaled for 800x800) ---
@@ -281,9 +345,10 @@ class Saraadventure(object):
                 hint = "TAB: EDITOR" if self.mode == "GAME" else "TAB: PLAY"
                 self.drow_text(hint, (670, 15), color=(200, 200, 200))
             else:
-                overlay = pygame.Surface((800, 800), pygame.SRCALPHA)
-                overlay.fill((0, 0, 0, 180))
-                self.screen.blit(overlay, (0, 0))
+                if self.quality.settings["overlay"]:
+                    overlay = pygame.Surface((800, 800), pygame.SRCALPHA)
+                    overlay.fill((0, 0, 0, 180))
+                    self.screen.blit(overlay, (0, 0))
                 
                 # Animated Pulsing Text
                 self.drow_text("VICTORY!", (400, 320), color=(255, 215, 0), font_type="big", center=True, scale=pulse_scale)
@@ -295,11 +360,16 @@ class Saraadventure(object):
 
             if self.mode == "EDITOR":
                 self.draw_editor()
-                if self.save_feedback_timer > 0:
-                    self.save_feedback_timer -= 1
+                if self.saver.is_busy():
+                    self.drow_text("SAVING...", (400, 700), color=(255, 255, 0), font_type="big", center=True)
+                elif current_time < self.save_feedback_until:
                     self.drow_text("SAVED!", (400, 700), color=(0, 255, 0), font_type="big", center=True)
 
             self.clock.tick(144)
+            # Raw time is the frame's work without the fps cap sleep
+            if self.quality.record(self.clock.get_rawtime()):
+                self.apply_quality()
+                print(f"\n--- QUALITY: {self.quality.name} ({self.quality.target_ms:.1f} ms target) ---")
             self.headle_input()
             pygame.display.flip()
 
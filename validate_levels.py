@@ -0,0 +1,147 @@
+import os, re, sys, json, argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # Headless, we only read image sizes
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # Keep stdout clean for the JSON report
+import pygame
+
+# Set working directory to the script's location (tileset paths are relative to it)
+LAUNCH_DIR = os.getcwd()
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from engine.collision import is_blocking
+from chars.sara import feet_rect_at
+from engine.level_data import LEVEL_1_FOREST, LEVEL_2_SPACE
+
+# Level number -> (config, trigger key, start_pos scale used by main.py when spawning)
+LEVELS = {
+    1: (LEVEL_1_FOREST, "portal_pos", 1),
+    2: (LEVEL_2_SPACE, "trophy_pos", 2),
+}
+WIDTH, HEIGHT = 20, 20
+TILE_SIZE = 40
+SOURCE_SIZE = 80
+FEET_OFFSET = feet_rect_at(0, 0).center # Middle of Sara's feet box inside her 96x96 rect
+
+@lru_cache(maxsize=None)
+def tile_count(tileset_path):
+    # Same slicing as Tileset._load_tiles, without needing a display
+    w, h = pygame.image.load(tileset_path).get_size()
+    return ((w + SOURCE_SIZE - 1) // SOURCE_SIZE) * ((h + SOURCE_SIZE - 1) // SOURCE_SIZE)
+
+def guess_level(path):
+    match = re.search(r"level_(\d+)", os.path.basename(path))
+    return int(match.group(1)) if match else 1
+
+def reachable(item, start, goals):
+    # BFS over cells with MapEngine.is_walkable rules (decorations are walkable)
+    seen = {start}
+    frontier = deque([start])
+    while frontier:
+        cell = frontier.popleft()
+        if cell in goals:
+            return True
+        cx, cy = cell
+        for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+            if 0 <= nx < WIDTH and 0 <= ny < HEIGHT and (nx, ny) not in seen:
+                if not is_blocking(item[ny * WIDTH + nx]):
+                    seen.add((nx, ny))
+                    frontier.append((nx, ny))
+    return False
+
+def validate(job):
+    # Never raises: any problem with one file ends up in that file's report
+    path, level = job
+    report = {"file": path, "level": level, "ok": False, "errors": []}
+    try:
+        check_level(path, level, report["errors"])
+    except Exception as e:
+        report["errors"].append(f"validation crashed: {type(e).__name__}: {e}")
+    report["ok"] = not report["errors"]
+    return report
+
+def check_level(path, level, errors):
+    if level not in LEVELS:
+        errors.append(f"unknown level {level}, expected one of {sorted(LEVELS)}")
+        return
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except Exception as e:
+        errors.append(f"cannot read: {e}")
+        return
+    if not isinstance(data, dict):
+        errors.append(f"expected a JSON object of layers, got {type(data).__name__}")
+        return
+
+    config, trigger_key, start_scale = LEVELS[level]
+    # Generated levels may carry their own config, editor saves only have layers
+    tileset = data.get("tileset", config["tileset"])
+    start_pos = data.get("start_pos", config["start_pos"])
+    trigger = data.get(trigger_key, config[trigger_key])
+
+    try:
+        count = tile_count(tileset)
+    except Exception as e:
+        errors.append(f"cannot load tileset {tileset}: {e}")
+        return
+
+    layers = {}
+    for layer_name, default in config["layers"].items():
+        layer = data.get(layer_name, default) # Missing layers fall back like load_level does
+        if not isinstance(layer, list):
+            errors.append(f"{layer_name}: expected a list of tile indices, got {type(layer).__name__}")
+            continue
+        if len(layer) != WIDTH * HEIGHT:
+            errors.append(f"{layer_name}: {len(layer)} cells, expected {WIDTH * HEIGHT}")
+            continue
+        # type() rather than isinstance: JSON true/false are bools, which isinstance accepts as int
+        bad = [i for i, idx in enumerate(layer) if type(idx) is not int or not -1 <= idx < count]
+        if bad:
+            errors.append(f"{layer_name}: {len(bad)} tile indices are not integers in -1..{count - 1}, first at cell {bad[0]}")
+        layers[layer_name] = layer
+
+    if "item" in layers:
+        item = layers["item"]
+        sx = int((start_pos[0] * start_scale + FEET_OFFSET[0]) // TILE_SIZE)
+        sy = int((start_pos[1] * start_scale + FEET_OFFSET[1]) // TILE_SIZE)
+        # check_interaction fires when Sara's center cell is within 1 cell of the trigger,
+        # her feet sit up to a cell lower than her center
+        tx, ty = trigger
+        goals = {(x, y) for x in range(tx - 1, tx + 2) for y in range(ty - 1, ty + 3)}
+        if not (0 <= sx < WIDTH and 0 <= sy < HEIGHT):
+            errors.append(f"start cell {(sx, sy)} is outside the map")
+        elif is_blocking(item[sy * WIDTH + sx]):
+            errors.append(f"start cell {(sx, sy)} is blocked by item {item[sy * WIDTH + sx]}")
+        elif not reachable(item, (sx, sy), goals):
+            errors.append(f"{trigger_key} {tuple(trigger)} is unreachable from start cell {(sx, sy)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Check saved levels for bad tiles and unreachable goals")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--level", type=int, choices=sorted(LEVELS), help="level rules to use (default: from file name, else 1)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    jobs = [(os.path.join(LAUNCH_DIR, path), args.level or guess_level(path)) for path in args.files]
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        reports = list(pool.map(validate, jobs, chunksize=max(1, len(jobs) // 64)))
+
+    summary = {
+        "checked": len(reports),
+        "failed": sum(1 for r in reports if not r["ok"]),
+        "results": reports,
+    }
+    text = json.dumps(summary, indent=2)
+    if args.output:
+        with open(os.path.join(LAUNCH_DIR, args.output), "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())